@@ -0,0 +1,80 @@
+"""
+Benchmark: scalar extract_currency_value vs vectorized parse_currency_column
+
+Builds a synthetic 50k-row column of formatted Sheets money cells and times both
+parsers. Run from the repository root:
+
+    python backend/benchmarks/currency_parser_benchmark.py [rows]
+"""
+import os
+import sys
+import time
+import random
+
+# server.py reads these at import time; the benchmark never connects to anything
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'benchmark')
+os.environ.setdefault('SHEETS_SNAPSHOT_PATH', '')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from server import extract_currency_value, parse_currency_column  # noqa: E402
+
+
+def brl(value):
+    """Format like the sheet does: R$ 1.234,56"""
+    text = f"{value:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+    return f"R$ {text}"
+
+
+def build_column(rows, seed=42):
+    """Mix of the cell shapes seen in month tabs"""
+    rng = random.Random(seed)
+    cells = []
+    for _ in range(rows):
+        kind = rng.random()
+        value = round(rng.uniform(0, 20000), 2)
+        if kind < 0.70:
+            cells.append(brl(value))                      # R$ 1.234,56
+        elif kind < 0.80:
+            cells.append('R$  -')                          # empty accounting cell
+        elif kind < 0.85:
+            cells.append(f"{value:.2f}".replace('.', ','))  # 1234,56
+        elif kind < 0.90:
+            cells.append(f"{int(value):,}".replace(',', '.'))  # 1.234
+        elif kind < 0.95:
+            cells.append('')
+        else:
+            cells.append(value)                            # typed number
+    return cells
+
+
+def best_of(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    cells = build_column(rows)
+
+    scalar_time, scalar_values = best_of(lambda: [extract_currency_value(cell) for cell in cells])
+    vector_time, vector_values = best_of(lambda: parse_currency_column(cells))
+    cents_time, _ = best_of(lambda: parse_currency_column(cells, as_cents=True))
+
+    mismatches = sum(1 for a, b in zip(scalar_values, vector_values.tolist()) if a != b)
+
+    print(f"📊 Currency parser benchmark ({rows} cells)")
+    print(f"   scalar extract_currency_value : {scalar_time * 1000:8.1f} ms")
+    print(f"   parse_currency_column         : {vector_time * 1000:8.1f} ms")
+    print(f"   parse_currency_column (cents) : {cents_time * 1000:8.1f} ms")
+    print(f"   speedup                       : {scalar_time / vector_time:8.1f}x")
+    print(f"   mismatches                    : {mismatches}")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
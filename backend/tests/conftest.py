@@ -0,0 +1,139 @@
+"""
+Test setup for backend/server.py
+server.py reads its configuration at import time; the tests never connect to
+MongoDB or Google Sheets, so placeholders are enough. The fake_sheets fixture
+serves an in-memory spreadsheet through an httpx MockTransport and gives the
+module fresh caches and in-memory collections.
+"""
+import os
+import sys
+from urllib.parse import unquote
+
+import httpx
+import pytest
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'dashboard_tests')
+os.environ['SHEETS_SNAPSHOT_PATH'] = ''
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+MONTH_HEADER = ["DATA DE VENDAS", "VENDAS", "CLIENTE", "", "FORMA DE PAGAMENTO", "", "", "", "",
+                "DATA DE SAÍDAS", "Descrição da Saída", "SAÍDA R$", "", "", "DATA DE PAGAMENTO",
+                "CLIENTE PAG", "PAGAMENTOS CREDIÁRIO"]
+
+
+def month_row(date, cliente='', venda='', pagamento=''):
+    """One month tab row: a sale in columns 0-2 and/or a crediário payment in columns 14-16"""
+    row = [''] * 17
+    row[0], row[1], row[2] = date, venda, cliente
+    if pagamento:
+        row[14], row[16] = date, pagamento
+    return row
+
+
+def contrato_rows(contratos):
+    """CREDIARIO POR CONTRATO tab for [(nome, total, [(data, valor), ...]), ...]"""
+    header = []
+    purchases = max((len(compras) for _, _, compras in contratos), default=0)
+    rows = [[], [], [], header] + [[] for _ in range(purchases)]
+    for nome, total, compras in contratos:
+        header += [nome, '', total]
+        for i in range(purchases):
+            data, valor = compras[i] if i < len(compras) else ('', '')
+            rows[4 + i] += ['', data, valor]
+    return rows
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs]
+
+
+class FakeCollection:
+    """The subset of a motor collection the server uses, in memory"""
+
+    def __init__(self):
+        self.docs = []
+
+    @staticmethod
+    def _matches(doc, query):
+        return all(doc.get(key) == value for key, value in query.items())
+
+    async def create_index(self, keys, **kwargs):
+        return None
+
+    async def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                doc.update(update.get("$set", {}))
+                return
+        if upsert:
+            doc = dict(query)
+            doc.update(update.get("$setOnInsert", {}))
+            doc.update(update.get("$set", {}))
+            self.docs.append(doc)
+
+    async def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            await self.update_one(operation._filter, operation._doc, upsert=operation._upsert)
+
+    def find(self, query=None, projection=None):
+        return FakeCursor([doc for doc in self.docs if self._matches(doc, query or {})])
+
+    async def find_one(self, query, projection=None, sort=None):
+        docs = [doc for doc in self.docs if self._matches(doc, query)]
+        for key, direction in reversed(sort or []):
+            docs.sort(key=lambda doc: doc.get(key), reverse=direction < 0)
+        return dict(docs[0]) if docs else None
+
+
+class FakeSheets(dict):
+    """{tab name: rows}, served like the Sheets values API; requests are recorded"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def handle(self, request):
+        self.requests.append(request)
+        path = unquote(request.url.path)
+        if path.endswith(':batchGet'):
+            value_ranges = []
+            for range_name in request.url.params.get_list('ranges'):
+                name = range_name.split('!')[0].strip("'")
+                if name not in self:
+                    return httpx.Response(400, json={"error": f"Unable to parse range: {range_name}"})
+                value_ranges.append({"range": range_name, "values": self[name]})
+            return httpx.Response(200, json={"valueRanges": value_ranges})
+        name = path.split('/values/')[1].split('!')[0].strip("'")
+        if name not in self:
+            return httpx.Response(400, json={"error": f"Unable to parse range: {name}"})
+        return httpx.Response(200, json={"values": self[name]})
+
+
+@pytest.fixture
+def fake_sheets(monkeypatch):
+    sheets = FakeSheets()
+    monkeypatch.setattr(server.sheets_client, "spreadsheet_id", "SID")
+    monkeypatch.setattr(server.sheets_client, "api_key", "KEY")
+    monkeypatch.setattr(server.sheets_client, "limiter", None)
+    monkeypatch.setattr(server.sheets_client, "_http",
+                        httpx.AsyncClient(base_url=server.sheets_client.base_url,
+                                          transport=httpx.MockTransport(sheets.handle)))
+
+    cache = server.SheetCacheLRU(server.SHEET_CACHE_MAX_BYTES)
+    monkeypatch.setitem(server.sheets_cache, "sheet_cache", cache)
+    monkeypatch.setitem(server.sheets_cache, "crediario_cache", {"data": None, "last_updated": None, "ttl": 600})
+    monkeypatch.setattr(server, "sheet_repository",
+                        server.SheetRepository(cache, server.SHEET_CACHE_TTL, server.SHEET_CACHE_MAX_STALENESS))
+    monkeypatch.setattr(server, "crediario_state", server.CrediarioState())
+    monkeypatch.setattr(server, "crediario_index", server.CrediarioIndex())
+    monkeypatch.setattr(server, "client_aliases", server.ClientAliasTable(FakeCollection()))
+    monkeypatch.setattr(server, "kpi_rollups", server.KpiRollupStore(FakeCollection(), server.SHEET_CACHE_TTL))
+    monkeypatch.setattr(server, "CREDIARIO_AGING_TODAY", "2025-09-30")
+    return sheets
@@ -0,0 +1,64 @@
+"""Serving the cached crediário result while background rebuilds fail"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+import server
+from conftest import MONTH_HEADER, contrato_rows
+
+
+@pytest.fixture
+def refresher(fake_sheets, monkeypatch):
+    fake_sheets["CREDIARIO"] = [["NOME", "VENDAS", "SALDO DEVEDOR"], ["ANA COSTA", "R$ 300,00", "R$ 200,00"]]
+    fake_sheets["CREDIARIO POR CONTRATO"] = contrato_rows([("ANA COSTA", "R$ 300,00", [("05/08/2025", "R$ 300,00")])])
+    for month_sheet in server.MONTH_SHEETS:
+        fake_sheets[month_sheet] = [MONTH_HEADER]
+    refresher = server.CrediarioRefresher(480, 60)
+    refresher.running = True
+    monkeypatch.setattr(server, "crediario_refresher", refresher)
+    return refresher
+
+
+def age_cache(seconds):
+    cache = server.sheets_cache["crediario_cache"]
+    cache["last_updated"] -= timedelta(seconds=seconds)
+
+
+def fail_next_rebuild(fake_sheets, refresher):
+    del fake_sheets["CREDIARIO POR CONTRATO"]
+    server.sheet_repository.invalidate()
+    server.sheet_repository.cache.clear()
+    asyncio.run(refresher.refresh())
+    assert refresher.failing()
+
+
+def test_last_result_is_served_marked_stale_within_the_bound(fake_sheets, refresher):
+    built = asyncio.run(refresher.refresh())
+    fail_next_rebuild(fake_sheets, refresher)
+    age_cache(server.SHEET_CACHE_MAX_STALENESS - 60)
+
+    assert asyncio.run(server.fetch_crediario_data()) is built
+    freshness = server.crediario_freshness()
+    assert freshness["stale"] is True
+    assert freshness["cache_age_seconds"] >= server.SHEET_CACHE_MAX_STALENESS - 60
+
+
+def test_last_error_is_reported_past_the_bound(fake_sheets, refresher):
+    asyncio.run(refresher.refresh())
+    fail_next_rebuild(fake_sheets, refresher)
+    age_cache(server.SHEET_CACHE_MAX_STALENESS)
+
+    result = asyncio.run(server.fetch_crediario_data())
+
+    assert result["success"] is False
+    assert refresher.last_error in result["error"]
+
+
+def test_fresh_result_is_not_stale(fake_sheets, refresher):
+    asyncio.run(refresher.refresh())
+
+    freshness = server.crediario_freshness()
+
+    assert freshness["stale"] is False
+    assert freshness["built_at"] == server.sheets_cache["crediario_cache"]["last_updated"].isoformat()
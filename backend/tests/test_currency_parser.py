@@ -0,0 +1,99 @@
+"""parse_currency_column against the scalar currency parser it replaced"""
+import random
+import re
+
+import pytest
+
+from server import extract_currency_value, parse_currency_column
+
+
+def legacy_extract_currency_value(value_str):
+    """extract_currency_value as it was before the vectorized parser (strings only)"""
+    if not value_str or value_str == '' or str(value_str).strip() == '':
+        return 0.0
+    clean_str = str(value_str).replace('R$', '').replace(' ', '')
+    if ',' in clean_str and '.' in clean_str:
+        clean_str = clean_str.replace('.', '').replace(',', '.')
+    elif ',' in clean_str and '.' not in clean_str:
+        clean_str = clean_str.replace(',', '.')
+    elif '.' in clean_str and len(clean_str.split('.')[-1]) == 3:
+        clean_str = clean_str.replace('.', '')
+    clean_str = re.sub(r'[^\d.-]', '', clean_str)
+    try:
+        return float(clean_str) if clean_str else 0.0
+    except ValueError:
+        return 0.0
+
+
+def brl(value):
+    text = f"{abs(value):,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+    return f"R$ {'-' if value < 0 else ''}{text}"
+
+
+def random_cell(rng):
+    value = round(rng.uniform(-50000, 50000), 2)
+    return rng.choice([
+        brl(value),
+        f"R${brl(value)[3:]}",
+        f"{value:.2f}".replace('.', ','),
+        f"{int(abs(value)):,}".replace(',', '.'),
+        f"{value:.2f}",
+        'R$  -',
+        '-',
+        '',
+        ' ',
+        'TOTAL',
+        f"{value:.2f}".replace('.', ',') + ' reais',
+        f"--{abs(value):.2f}",
+        f"1.2.{rng.randint(0, 999)}",
+        f"R$ {rng.randint(0, 10 ** 18)}",
+        f"€ {value:.2f}".replace('.', ','),
+    ])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_legacy_parser_on_random_strings(seed):
+    rng = random.Random(seed)
+    cells = [random_cell(rng) for _ in range(2000)]
+
+    values = parse_currency_column(cells).tolist()
+
+    assert values == [legacy_extract_currency_value(cell) for cell in cells]
+
+
+def test_typed_numbers_pass_through():
+    cells = [1234.56, -7, 0, 0.1, 'R$ 2,50']
+
+    assert parse_currency_column(cells).tolist() == [1234.56, -7.0, 0.0, 0.1, 2.5]
+    assert [extract_currency_value(cell) for cell in cells] == [1234.56, -7.0, 0.0, 0.1, 2.5]
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ('R$ -1.234,56', -1234.56),
+    ('R$ 1.234,56', 1234.56),
+    ('1234,56', 1234.56),
+    ('1.234', 1234.0),
+    ('1.23', 1.23),
+    ('', 0.0),
+    ('   ', 0.0),
+    ('-', 0.0),
+    ('R$  -', 0.0),
+    ('R$ 1.234,56-', 0.0),
+    ('1,2,3', 0.0),
+    (None, 0.0),
+])
+def test_brl_edge_cases(cell, expected):
+    assert parse_currency_column([cell]).tolist() == [expected]
+    assert extract_currency_value(cell) == expected
+
+
+def test_cents():
+    cells = ['R$ 0,10', 'R$ 0,20', 'R$ -1.234,56', 19.99]
+
+    assert parse_currency_column(cells, as_cents=True).tolist() == [10, 20, -123456, 1999]
+
+
+def test_non_ascii_and_long_numbers_fall_back_to_the_scalar_parser():
+    cells = ['R$ 1.234,56 ✓', 'R$ 123456789012345678,99', 'ção 12,5']
+
+    assert parse_currency_column(cells).tolist() == [legacy_extract_currency_value(cell) for cell in cells]
@@ -0,0 +1,118 @@
+"""Incremental crediário rebuilds: only clients touched by a change are recomputed"""
+import asyncio
+
+import pytest
+
+import server
+from conftest import MONTH_HEADER, contrato_rows, month_row
+
+CONTRATOS = [
+    ("ANA COSTA", "R$ 300,00", [("05/08/2025", "R$ 300,00")]),
+    ("MARIA SILVA", "R$ 500,00", [("02/07/2025", "R$ 200,00"), ("10/08/2025", "R$ 300,00")]),
+    ("PEDRO ALVES", "R$ 150,00", [("01/09/2025", "R$ 150,00")]),
+    ("FERNANDA LIMA", "R$ 800,00", [("15/06/2025", "R$ 800,00")]),
+]
+
+
+@pytest.fixture
+def spreadsheet(fake_sheets):
+    fake_sheets["CREDIARIO"] = [
+        ["NOME", "VENDAS", "SALDO DEVEDOR"],
+        ["ANA COSTA", "R$ 300,00", "R$ 200,00"],
+        ["MARIA SILVA", "R$ 500,00", "R$ 450,00"],
+        ["PEDRO ALVES", "R$ 150,00", "R$ 100,00"],
+        ["FERNANDA LIMA", "R$ 800,00", "R$ 800,00"],
+    ]
+    fake_sheets["CREDIARIO POR CONTRATO"] = contrato_rows(CONTRATOS)
+    for month_sheet in server.MONTH_SHEETS:
+        fake_sheets[month_sheet] = [MONTH_HEADER, month_row("01/01/2025", "BALCAO", venda="R$ 10,00")]
+    fake_sheets["AGOSTO25"] += [
+        month_row("05/08/2025", "ANA COSTA", pagamento="R$ 100,00"),
+        month_row("12/08/2025", "MARIA SILVA", pagamento="R$ 50,00"),
+    ]
+    fake_sheets["SETEMBRO25"] += [
+        month_row("03/09/2025", "PEDRO ALVES", pagamento="R$ 50,00"),
+    ]
+    return fake_sheets
+
+
+def rebuild():
+    server.sheet_repository.invalidate()
+    return asyncio.run(server.rebuild_crediario_data())
+
+
+def by_name(result):
+    return {cliente.nome: cliente.dict(exclude={"id"}) for cliente in result["clientes"]}
+
+
+def test_unchanged_sheets_recompute_nobody(spreadsheet):
+    first = rebuild()
+    second = rebuild()
+
+    assert first["clientes_recalculados"] == 4
+    assert second["clientes_recalculados"] == 0
+    assert server.crediario_state.stats()["last_reused"] == 4
+    assert by_name(second) == by_name(first)
+
+
+def test_new_payment_row_recomputes_only_its_client(spreadsheet):
+    rebuild()
+    spreadsheet["SETEMBRO25"].append(
+        month_row("20/09/2025", "MARIA SILVA", pagamento="R$ 25,00"))
+
+    result = rebuild()
+
+    assert result["clientes_recalculados"] == 1
+    assert server.crediario_state.stats()["last_changed_payment_rows"] == 1
+    maria = next(cliente for cliente in result["clientes"] if cliente.nome == "MARIA SILVA")
+    assert "20/09/2025" in [pagamento["data"] for pagamento in maria.pagamentos]
+
+
+def test_removed_payment_row_recomputes_only_its_client(spreadsheet):
+    rebuild()
+    spreadsheet["AGOSTO25"].pop(2)
+
+    result = rebuild()
+
+    assert result["clientes_recalculados"] == 1
+    ana = next(cliente for cliente in result["clientes"] if cliente.nome == "ANA COSTA")
+    assert ana.pagamentos == []
+    assert ana.dias_sem_pagamento == server.NO_PAYMENT_DAYS
+
+
+def test_saldo_change_recomputes_only_its_client(spreadsheet):
+    rebuild()
+    spreadsheet["CREDIARIO"][4] = ["FERNANDA LIMA", "R$ 800,00", "R$ 650,00"]
+
+    result = rebuild()
+
+    assert result["clientes_recalculados"] == 1
+    assert by_name(result)["FERNANDA LIMA"]["saldo_devedor"] == 650.0
+
+
+def test_incremental_result_equals_a_full_rebuild(spreadsheet, monkeypatch):
+    rebuild()
+    spreadsheet["SETEMBRO25"].append(
+        month_row("22/09/2025", "FERNANDA LIMA", pagamento="R$ 100,00"))
+    spreadsheet["CREDIARIO"][1] = ["ANA COSTA", "R$ 300,00", "R$ 150,00"]
+    incremental = rebuild()
+
+    monkeypatch.setattr(server, "crediario_state", server.CrediarioState())
+    full = rebuild()
+
+    assert incremental["clientes_recalculados"] == 2
+    assert full["clientes_recalculados"] == 4
+    assert by_name(incremental) == by_name(full)
+
+
+def test_client_detail_is_served_without_sheets_reads(spreadsheet):
+    spreadsheet["JULHO25"].append(month_row("14/07/2025", "Maria Silva", venda="R$ 200,00"))
+    rebuild()
+    requests = len(spreadsheet.requests)
+    maria = next(cliente for cliente in server.sheets_cache["crediario_cache"]["data"]["clientes"]
+                 if cliente.nome == "MARIA SILVA")
+
+    detail = asyncio.run(server.get_crediario_cliente(maria.id))
+
+    assert detail["historico_compras"] == [{"data": "14/07/2025", "valor": 200.0}]
+    assert len(spreadsheet.requests) == requests
@@ -0,0 +1,98 @@
+"""KpiRollupStore: stored rollups first, Sheets only for months without one"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+from conftest import MONTH_HEADER, month_row
+
+
+@pytest.fixture
+def months(fake_sheets):
+    for day, month_sheet in enumerate(server.MONTH_SHEETS, start=1):
+        fake_sheets[month_sheet] = [MONTH_HEADER,
+                                    month_row(f"{day:02d}/01/2025", "ANA COSTA", venda="R$ 100,00"),
+                                    month_row(f"{day:02d}/01/2025", "BALCAO", venda=f"R$ {day},00")]
+    return fake_sheets
+
+
+async def settle():
+    """Let the background rollup refresh finish"""
+    while server.kpi_rollups._task is not None and not server.kpi_rollups._task.done():
+        await server.kpi_rollups._task
+
+
+def stored_docs():
+    return server.kpi_rollups.collection.docs
+
+
+def test_month_without_a_stored_rollup_is_read_from_sheets_and_stored(months):
+    async def scenario():
+        first = await server.kpi_rollups.get("MARÇO25")
+        await settle()
+        return first, await server.kpi_rollups.get("MARÇO25")
+
+    first, second = asyncio.run(scenario())
+
+    assert first["data_source"] == "sheets"
+    assert [doc["sheet"] for doc in stored_docs()] == ["MARÇO25"]
+    assert second["data_source"] == "kpi_rollups"
+    assert second["stale"] is False
+    assert second["kpis"] == first["kpis"]
+    assert second["computed_at"] == first["computed_at"]
+
+
+def test_stored_rollup_is_served_without_sheets_reads(months):
+    asyncio.run(server.kpi_rollups.refresh(server.MONTH_SHEETS))
+    requests = len(months.requests)
+
+    summary = asyncio.run(server.get_dashboard_summary("ano", None, False))
+
+    assert len(months.requests) == requests
+    assert summary.data_source == "kpi_rollups"
+    assert summary.faturamento == 9 * 100 + sum(range(1, 10))
+    assert summary.stale is False
+    assert summary.computed_at is not None
+
+
+def test_old_rollup_is_served_stale_and_refreshed_in_the_background(months):
+    asyncio.run(server.kpi_rollups.refresh(["ABRIL25"]))
+    old = datetime.now(timezone.utc) - timedelta(seconds=server.SHEET_CACHE_TTL + 30)
+    stored_docs()[0]["last_seen"] = old.replace(tzinfo=None)
+    server.sheet_repository.invalidate()
+
+    async def scenario():
+        served = await server.kpi_rollups.get("ABRIL25")
+        await settle()
+        return served
+
+    served = asyncio.run(scenario())
+
+    assert served["data_source"] == "kpi_rollups"
+    assert served["stale"] is True
+    assert served["cache_age_seconds"] >= server.SHEET_CACHE_TTL + 30
+    assert stored_docs()[0]["last_seen"] > old
+
+
+def test_stored_rollup_outlives_a_sheets_outage(months):
+    asyncio.run(server.kpi_rollups.refresh(["MAIO25"]))
+    months.clear()
+    server.sheet_repository.cache.clear()
+
+    month_data = asyncio.run(server.extract_current_month_data("MAIO25"))
+
+    assert month_data["faturamento"] == 105.0
+    assert month_data["data_source"] == "kpi_rollups"
+
+
+def test_changed_tab_becomes_the_latest_rollup(months):
+    asyncio.run(server.kpi_rollups.refresh(["JUNHO25"]))
+    months["JUNHO25"].append(month_row("20/01/2025", "ANA COSTA", venda="R$ 50,00"))
+    server.sheet_repository.invalidate()
+    asyncio.run(server.kpi_rollups.refresh(["JUNHO25"]))
+
+    rollup = asyncio.run(server.kpi_rollups.get("JUNHO25"))
+
+    assert len(stored_docs()) == 2
+    assert rollup["kpis"]["faturamento"] == 156.0
@@ -0,0 +1,116 @@
+"""ClientNameIndex lookups against the per-row scans they replaced"""
+import random
+
+import numpy as np
+import pytest
+from rapidfuzz import fuzz
+
+from server import CLIENT_NAME_COLUMNS, MonthColumns
+
+NAMES = ["maria silva", "maria silvia", "maria", "marias", "ana costa", "ana c0sta", "catia roth", "katia roth",
+         "luciana", "luciano", "katia", "catia", "joao", "joão", "pedro alves", "alves", "silva", "rosangela",
+         "rosangelo", "aleksya dallabrida", "aleksia dalabrida", "bia", "fernanda lima", "fernando lima"]
+
+
+def legacy_payment_match(client_name_normalized, row):
+    """Name rules of the old payment-history row scan"""
+    for col_index in CLIENT_NAME_COLUMNS:
+        if len(row) > col_index and row[col_index]:
+            cell_value = str(row[col_index]).strip().casefold()
+            if client_name_normalized == cell_value:
+                return True
+            client_words = client_name_normalized.split()
+            cell_words = cell_value.split()
+            if len(client_words) >= 2 and len(cell_words) >= 1:
+                if any(len(word) > 2 and word in [w for w in cell_words if len(w) > 2] for word in client_words):
+                    return True
+            elif len(client_name_normalized) > 4 and len(cell_value) > 4:
+                if fuzz.ratio(client_name_normalized, cell_value) > 85:
+                    return True
+    return False
+
+
+def legacy_purchase_match(client_name_normalized, row):
+    """Name rules of the old purchase-history row scan"""
+    for col_index in CLIENT_NAME_COLUMNS:
+        if len(row) > col_index and row[col_index]:
+            cell_value = str(row[col_index]).strip().casefold()
+            if client_name_normalized == cell_value:
+                return True
+            if client_name_normalized in cell_value or cell_value in client_name_normalized:
+                return True
+            if len(client_name_normalized) > 3 and len(cell_value) > 3:
+                if fuzz.ratio(client_name_normalized, cell_value) > 80:
+                    return True
+    return False
+
+
+def month_row(rng):
+    row = [''] * 17
+    row[0] = f"{rng.randint(1, 28):02d}/09/2025"
+    row[1] = f"R$ {rng.randint(1, 900)},00"
+    for col in rng.sample(CLIENT_NAME_COLUMNS, rng.randint(0, 2)):
+        name = rng.choice(NAMES)
+        row[col] = rng.choice([name, name.upper(), f" {name.title()} "])
+    if rng.random() < 0.7:
+        row[14] = f"{rng.randint(1, 28):02d}/09/2025"
+        row[16] = f"R$ {rng.randint(1, 500)},00"
+    return row
+
+
+def random_month(seed, size=120):
+    rng = random.Random(seed)
+    return MonthColumns([['DATA', 'VENDAS'] + [''] * 15] + [month_row(rng) for _ in range(size)])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_payment_matches_agree_with_legacy_scan(seed):
+    month = random_month(seed)
+    payment_rows = np.flatnonzero(month.payment_rows).tolist()
+
+    for client in NAMES + ["Maria Silva", "ze", "rosangela souza"]:
+        normalized = client.strip().casefold()
+        expected = [i for i in payment_rows if legacy_payment_match(normalized, month.rows[i])]
+
+        assert month.payment_index.payment_matches(normalized) == expected, client
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_purchase_matches_agree_with_legacy_scan(seed):
+    month = random_month(seed)
+    purchase_rows = np.flatnonzero(month.purchase_rows).tolist()
+
+    for client in NAMES + ["Maria Silva", "ze", "rosangela souza"]:
+        normalized = client.strip().casefold()
+        expected = [i for i in purchase_rows if legacy_purchase_match(normalized, month.rows[i])]
+
+        assert month.purchase_index.purchase_matches(normalized) == expected, client
+
+
+def single_name_month(*names):
+    rows = [['DATA', 'VENDAS'] + [''] * 15]
+    for name in names:
+        row = [''] * 17
+        row[0], row[1], row[2], row[14], row[16] = '01/09/2025', 'R$ 10,00', name, '01/09/2025', 'R$ 10,00'
+        rows.append(row)
+    return MonthColumns(rows)
+
+
+def test_payment_fuzzy_threshold_is_exclusive_at_85():
+    at_threshold, above = "rosangelamariasoqwxa", "luciano"
+    assert fuzz.ratio("rosangelamariasouzaa", at_threshold) == 85.0
+    assert 85.0 < fuzz.ratio("luciana", above) < 86.0
+    month = single_name_month(at_threshold, above)
+
+    assert month.payment_index.payment_matches("rosangelamariasouzaa") == []
+    assert month.payment_index.payment_matches("luciana") == [2]
+
+
+def test_purchase_fuzzy_threshold_is_exclusive_at_80():
+    at_threshold, above = "katia", "valdirenecristinaqwxy"
+    assert fuzz.ratio("catia", at_threshold) == 80.0
+    assert 80.0 < fuzz.ratio("valdirenecristinalope", above) < 81.0
+    month = single_name_month(at_threshold, above)
+
+    assert month.purchase_index.purchase_matches("catia") == []
+    assert month.purchase_index.purchase_matches("valdirenecristinalope") == [2]
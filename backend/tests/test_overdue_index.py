@@ -0,0 +1,46 @@
+"""CrediarioIndex overdue view: bucket boundaries and paging"""
+import pytest
+
+from server import OVERDUE_BUCKETS, ClienteCrediario, CrediarioIndex
+
+DIAS = [999, 121, 120, 91, 90, 61, 60, 31, 30, 0]
+
+
+@pytest.fixture
+def index():
+    clientes = [ClienteCrediario(nome=f"CLIENTE {dias}", saldo_devedor=float(1000 - i), dias_sem_pagamento=dias)
+                for i, dias in enumerate(reversed(DIAS))]
+    return CrediarioIndex().update({"clientes": clientes})
+
+
+def test_bucket_labels_match_their_bounds():
+    for label, low, high in OVERDUE_BUCKETS:
+        assert label == (f"{low}-{high}" if high is not None else f"{low}+")
+
+
+def test_bucket_boundaries_are_inclusive(index):
+    assert {label: bucket["clientes"] for label, bucket in index.overdue_buckets.items()} == {
+        "31-60": 2, "61-90": 2, "91-120": 2, "121+": 2}
+    assert index.overdue_buckets["121+"]["saldo_devedor"] == 992.0 + 991.0
+
+
+def test_clients_under_31_days_are_not_overdue(index):
+    rows, total = index.overdue_page(31, None, 0, "dias")
+
+    assert total == 8
+    assert [row["dias_sem_pagamento"] for row in rows] == DIAS[:8]
+
+
+@pytest.mark.parametrize("min_dias, expected", [(120, [999, 121, 120]), (121, [999, 121]), (61, DIAS[:6])])
+def test_min_dias_is_inclusive(index, min_dias, expected):
+    rows, total = index.overdue_page(min_dias, None, 0, "dias")
+
+    assert [row["dias_sem_pagamento"] for row in rows] == expected
+    assert total == len(expected)
+
+
+def test_pages_by_saldo(index):
+    rows, total = index.overdue_page(31, 3, 1, "saldo")
+
+    assert total == 8
+    assert [row["saldo_devedor"] for row in rows] == [997.0, 996.0, 995.0]
@@ -0,0 +1,52 @@
+"""payment_aging: days since each client's last payment against a reference date"""
+from datetime import datetime
+
+import pytest
+
+import server
+from server import NO_PAYMENT_DAYS, SHEETS_EPOCH, ClienteCrediario, payment_aging
+
+TODAY = (datetime(2025, 9, 30) - SHEETS_EPOCH).days
+
+
+def cliente(*datas):
+    return ClienteCrediario(nome="ANA COSTA", pagamentos=[{"data": data, "valor": 10.0} for data in datas])
+
+
+def aging(*clientes):
+    dias, atrasados = payment_aging(list(clientes), TODAY)
+    return dias.tolist(), atrasados.tolist()
+
+
+def test_days_since_the_latest_payment():
+    assert aging(cliente("01/09/2025", "20/09/2025", "15/08/2025")) == ([10], [False])
+
+
+def test_typed_serial_dates_count_like_text_dates():
+    assert aging(cliente(TODAY - 45), cliente("16/08/2025")) == ([45, 45], [False, False])
+
+
+def test_no_dated_payment_reports_no_payment_days():
+    assert aging(cliente(), cliente("", "sem data")) == ([NO_PAYMENT_DAYS] * 2, [True, True])
+
+
+def test_future_payments_count_as_zero_days():
+    assert aging(cliente("05/10/2025")) == ([0], [False])
+
+
+@pytest.mark.parametrize("data, dias, atrasado", [
+    ("31/07/2025", 61, True),
+    ("01/08/2025", 60, False),
+])
+def test_overdue_flag_is_strictly_over_60_days(data, dias, atrasado):
+    assert aging(cliente(data)) == ([dias], [atrasado])
+
+
+def test_empty_client_list():
+    assert aging() == ([], [])
+
+
+def test_aging_today_follows_the_configured_date(monkeypatch):
+    monkeypatch.setattr(server, "CREDIARIO_AGING_TODAY", "2025-09-30")
+
+    assert server.aging_today_serial() == TODAY
@@ -0,0 +1,54 @@
+"""RequestMemoScope: one derived_memo scope per HTTP request"""
+import asyncio
+
+from server import RequestMemoScope, request_memo
+
+
+def run(middleware, scope_type):
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    asyncio.run(middleware({"type": scope_type}, receive, send))
+
+
+def test_each_request_gets_a_fresh_scope():
+    seen = []
+
+    async def endpoint(scope, receive, send):
+        memo = request_memo.get()
+        memo[("key",)] = len(seen)
+        seen.append(memo)
+
+    middleware = RequestMemoScope(endpoint)
+    run(middleware, "http")
+    run(middleware, "http")
+
+    assert seen == [{("key",): 0}, {("key",): 1}]
+    assert seen[0] is not seen[1]
+    assert request_memo.get() is None
+
+
+def test_scope_is_reset_when_the_endpoint_fails():
+    async def endpoint(scope, receive, send):
+        raise RuntimeError("boom")
+
+    try:
+        run(RequestMemoScope(endpoint), "http")
+    except RuntimeError:
+        pass
+
+    assert request_memo.get() is None
+
+
+def test_other_scopes_pass_through_without_a_memo():
+    seen = []
+
+    async def endpoint(scope, receive, send):
+        seen.append(request_memo.get())
+
+    run(RequestMemoScope(endpoint), "lifespan")
+
+    assert seen == [None]
@@ -0,0 +1,85 @@
+"""match_saldo_names (one cdist matrix) against the per-name loop it replaced"""
+import random
+
+import pytest
+from rapidfuzz import fuzz, process
+
+from server import SALDO_MATCH_THRESHOLD, match_saldo_names
+
+STORED = ["MARIA SILVA", "ANA COSTA", "CATIA ROTH", "PEDRO ALVES", "JOAO DA SILVA", "ALEKSYA DALLABRIDA",
+          "FERNANDA LIMA", "ROSANGELA SOUZA", "BIA", "LUCIANA PEREIRA SANTOS", "MARCOS"]
+
+
+def legacy_match(nome_upper, saldos_devedores):
+    """Name resolution of the old per-contract loop (overrides aside)"""
+    if nome_upper in saldos_devedores:
+        return nome_upper
+    stored_names = list(saldos_devedores)
+    if not stored_names:
+        return None
+    best_match = process.extractOne(nome_upper, stored_names, scorer=fuzz.ratio)
+    if best_match and best_match[1] > SALDO_MATCH_THRESHOLD:
+        return best_match[0]
+    for stored_name in stored_names:
+        if nome_upper in stored_name or stored_name in nome_upper:
+            return stored_name
+        nome_words = nome_upper.split()
+        stored_words = stored_name.split()
+        if len(nome_words) >= 2 and len(stored_words) >= 2:
+            if nome_words[0] == stored_words[0] and nome_words[-1] == stored_words[-1]:
+                return stored_name
+    return None
+
+
+def mutate(rng, name):
+    kind = rng.random()
+    if kind < 0.2:
+        return name
+    if kind < 0.4:
+        position = rng.randrange(len(name))
+        return name[:position] + rng.choice("ABCDEXYZ0") + name[position + 1:]
+    if kind < 0.55:
+        return name.split()[0]
+    if kind < 0.7:
+        words = name.split()
+        return f"{words[0]} DE {words[-1]}" if len(words) > 1 else name + " NETO"
+    if kind < 0.85:
+        return name + " " + rng.choice(["JR", "FILHO", "SANTOS"])
+    return "".join(rng.sample(name, len(name)))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_legacy_loop_on_random_names(seed):
+    rng = random.Random(seed)
+    stored = rng.sample(STORED, rng.randint(1, len(STORED)))
+    saldos_devedores = {name: {} for name in stored}
+    nomes = [mutate(rng, rng.choice(STORED)) for _ in range(60)]
+
+    matches = match_saldo_names(nomes, stored)
+
+    assert [matched for matched, _ in matches] == [legacy_match(nome, saldos_devedores) for nome in nomes]
+
+
+def test_rules_are_reported():
+    stored = ["MARIA SILVA", "LUCIANA PEREIRA SANTOS", "JOAO DA SILVA"]
+
+    assert match_saldo_names(["MARIA SILVA", "MARIA SILVS", "LUCIANA", "JOAO CARLOS PEREIRA SILVA", "ZZZ"], stored) == [
+        ("MARIA SILVA", "exact"),
+        ("MARIA SILVA", "fuzzy 90.9%"),
+        ("LUCIANA PEREIRA SANTOS", "partial"),
+        ("JOAO DA SILVA", "word"),
+        (None, None),
+    ]
+
+
+def test_fuzzy_threshold_is_exclusive():
+    assert fuzz.ratio("JOSEFINA", "JOSEFIXY") == SALDO_MATCH_THRESHOLD
+    assert fuzz.ratio("JOSEFINAS", "JOSEFINXY") > SALDO_MATCH_THRESHOLD
+
+    assert match_saldo_names(["JOSEFIXY"], ["JOSEFINA"]) == [(None, None)]
+    assert match_saldo_names(["JOSEFINXY"], ["JOSEFINAS"])[0][0] == "JOSEFINAS"
+
+
+def test_empty_inputs():
+    assert match_saldo_names([], ["MARIA SILVA"]) == []
+    assert match_saldo_names(["MARIA SILVA"], []) == [(None, None)]
@@ -0,0 +1,91 @@
+"""total_line_mask against the per-row loop it replaced"""
+import random
+
+import numpy as np
+import pytest
+
+from server import MonthColumns, month_kpis, total_line_mask
+
+
+def legacy_total_lines(values, pool):
+    """Old rule: a pooled value within 50 cents of the sum of every other, different pooled value"""
+    pooled = values[pool]
+    mask = np.zeros(len(values), dtype=bool)
+    for row_index in np.flatnonzero(pool):
+        others = pooled[pooled != values[row_index]]
+        mask[row_index] = bool(others.size) and abs(float(values[row_index]) - float(others.sum())) < 0.50
+    return mask
+
+
+def random_column(rng):
+    size = rng.randint(0, 40)
+    values = np.array([round(rng.uniform(0, 900), 2) if rng.random() < 0.8 else 0.0 for _ in range(size)])
+    if size > 2 and rng.random() < 0.6:
+        # Inject a total line, sometimes a few cents off, sometimes too far off to count
+        position = rng.randrange(size)
+        values[position] = 0.0
+        offset = rng.choice([0.0, 0.3, -0.3, 0.8, -0.8])
+        values[position] = round(float(values[values > 0].sum()) + offset, 2)
+    if size > 4 and rng.random() < 0.3:
+        values[rng.randrange(size)] = values[rng.randrange(size)]  # repeated values
+    return values
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_legacy_loop_on_random_columns(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        values = random_column(rng)
+        pool = values > 0
+
+        assert total_line_mask(values, pool).tolist() == legacy_total_lines(values, pool).tolist()
+
+
+def test_total_line_is_detected():
+    values = np.array([100.0, 50.0, 25.5, 175.5])
+
+    assert total_line_mask(values, values > 0).tolist() == [False, False, False, True]
+
+
+def test_tolerance_is_fifty_cents_exclusive():
+    within = np.array([100.0, 50.0, 150.49])
+    outside = np.array([100.0, 50.0, 150.5])
+
+    assert total_line_mask(within, within > 0).tolist() == [False, False, True]
+    assert total_line_mask(outside, outside > 0).tolist() == [False, False, False]
+
+
+def test_rows_sharing_the_value_are_left_out_of_the_sum():
+    values = np.array([80.0, 80.0, 40.0, 40.0, 80.0])
+
+    # Each 80 is compared with 40 + 40 only, so every 80 counts as a total line
+    assert total_line_mask(values, values > 0).tolist() == [True, True, False, False, True]
+
+
+def test_single_value_and_empty_pool_are_not_totals():
+    values = np.array([120.0, 120.0])
+
+    assert not total_line_mask(values, values > 0).any()
+    assert not total_line_mask(np.array([]), np.array([], dtype=bool)).any()
+
+
+def month_row(date, valor_crediario, cliente='ANA COSTA'):
+    row = [''] * 17
+    row[0] = date
+    row[14] = date
+    row[15] = cliente
+    row[16] = valor_crediario
+    return row
+
+
+def test_month_kpis_skip_the_total_line():
+    header = ['DATA', 'VENDAS'] + [''] * 15
+    rows = [header,
+            month_row('02/09/2025', 'R$ 120,00'),
+            month_row('03/09/2025', 'R$ 80,00'),
+            month_row('30/09/2025', 'R$ 200,00', cliente='')]
+
+    month = MonthColumns(rows)
+
+    assert month.crediario_total_line.tolist() == [False, False, False, True]
+    assert month_kpis("SETEMBRO25", month)["recebido_crediario"] == 200.0